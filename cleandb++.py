@@ -4,88 +4,151 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pac
+import pyarrow.parquet as pq
 import re
+import csv
 import os
+import sys
+import json
 import threading
+import queue
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+#files larger than this are streamed in blocks of CSV_BLOCK_SIZE bytes to bound peak memory;
+#CSV_CHUNK_SIZE rows are read at a time when such a file has to be read by pandas instead
+LARGE_FILE_THRESHOLD = 512 * 1024 * 1024
+CSV_BLOCK_SIZE = 64 * 1024 * 1024
+CSV_CHUNK_SIZE = 500_000
+
+#each worker process may hold a whole file in memory, so only a few files are cleaned at once
+MAX_WORKERS = 4
+
+#first number (optionally signed or decimal) in a cell, compiled once for all columns.
+#the named group lets pyarrow.compute run the same pattern on its RE2 engine
+_NUM_PATTERN = r"(?P<number>[-+]?\d*\.?\d+)"
+_NUM_RE = re.compile(_NUM_PATTERN)
+
+#a cell that is one number as a whole, in the forms pd.to_numeric accepts
+_WHOLE_NUM_PATTERN = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+
+#Arrow-backed string dtype used for text columns
+_ARROW_STRING = pd.ArrowDtype(pa.string())
+
+#header cleaning patterns
+_HEADER_CHINESE_PARENS_RE = re.compile(r"[（）]")
+_HEADER_PARENS_RE = re.compile(r"\(.*?\)")
+_HEADER_BAD_CHARS_RE = re.compile(r"[^a-zA-Z0-9_\s-]")
+_HEADER_UNDERSCORES_RE = re.compile(r"_+")
+
+#after _HEADER_BAD_CHARS_RE the only non-ASCII characters left are unicode whitespace
+#(matched by \s), so deleting those with str.translate leaves a pure ASCII header
+_HEADER_NON_ASCII_TABLE = {c: None for c in range(0x80, sys.maxunicode + 1) if chr(c).isspace()}
+
+def _to_float(series):
+    #object columns of True/False/None become plain float64, with None as NaN
+    return pd.to_numeric(series, errors='coerce').astype('float64')
+
+def _float_series(array, index):
+    #Arrow nulls become NaN in a plain float64 column
+    return pd.Series(array.to_numpy(zero_copy_only=False), index=index, dtype='float64')
+
+def _extract_numeric_series(series):
+    #numeric (and boolean) columns are already clean
+    if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        return series
+
+    #booleans with missing values are read as object columns of True/False/None;
+    #they become 1.0/0.0 before the text checks below, which would find no digits in them
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+        return _to_float(series)
+
+    #low-cardinality text such as "Male"/"Female" is judged from its few distinct values;
+    #if none of them contains a number the column can't yield any and is skipped.
+    #the first rows are checked first so high-cardinality columns skip the full unique() pass
+    max_uniques = min(32, 0.01 * len(series))
+    if series.iloc[:1000].nunique() < max_uniques:
+        uniques = series.dropna().unique()
+        if len(uniques) < max_uniques and not any(_NUM_RE.search(str(value)) for value in uniques):
+            return pd.Series(float('nan'), index=series.index)
+
+    #text is processed as an Arrow array with pyarrow.compute, which runs in C++ and
+    #releases the GIL, so the GUI thread is not held up by string processing
+    text = series if series.dtype == _ARROW_STRING else series.astype('string').astype(_ARROW_STRING)
+    text = pc.utf8_trim_whitespace(pa.array(text))
+
+    #text columns that parse cleanly as numbers don't need the regex path at all
+    try:
+        return _float_series(pc.cast(text, pa.float64()), series.index)
+    except pa.ArrowInvalid:
+        pass
 
-def extract_numeric(value):
+    #cells that already are a single number are kept as they are
+    whole_numbers = pc.if_else(pc.match_substring_regex(text, _WHOLE_NUM_PATTERN), text, None)
+    numeric = pc.cast(whole_numbers, pa.float64())
 
-    if isinstance(value, str):
-        #handle potential percentage signs or other common non-numeric chars before extraction
-        value = value.replace('%', '').strip()
-        match = re.search(r"[-+]?\d*\.?\d+", value)
-        return float(match.group()) if match else pd.NA
-    elif isinstance(value, (int, float)):
-        return float(value)
-    return pd.NA
+    #extract the first number from the remaining cells on pyarrow's RE2 engine
+    #handle percentage signs before extraction
+    text = pc.replace_substring(text, '%', '')
+    extracted = pc.cast(pc.struct_field(pc.extract_regex(text, _NUM_PATTERN), [0]), pa.float64())
 
-def clean_mixed_columns(df, logger_func=print):
+    return _float_series(pc.coalesce(numeric, extracted), series.index)
 
-    for column in df.columns:
-        #attempt conversion only if the column is of object type and not entirely NA
-        if df[column].dtype == "object" and not df[column].isna().all():
-            try:
-                #create a new series for cleaned values
-                cleaned_series = df[column].apply(extract_numeric)
+def extract_numeric_columns(df, logger_func=print):
 
-                # if no numbers are found.
-                if cleaned_series.notna().any() or df[column].apply(lambda x: isinstance(x, str) and extract_numeric(x) is pd.NA).all():
-                     df[column] = cleaned_series
-                # else:
-                #    logger_func(f"Column '{column}' contained no extractable numeric data and was left as is.")
+    #each column is converted to numbers exactly once; columns where no number
+    #could be extracted (or that were entirely NA) are left out of the result
+    numeric_cols = {}
+    for column, series in df.items():
+        try:
+            cleaned_series = _extract_numeric_series(series)
+        except Exception as e:
+            logger_func(f"Error processing column {column} for numeric extraction: {e}")
+            continue
+        if cleaned_series.notna().any():
+            numeric_cols[column] = cleaned_series
 
-            except Exception as e:
-                logger_func(f"Error processing column {column} for numeric extraction: {e}")
-    return df
+    if not numeric_cols:
+        logger_func("Warning: No numeric columns found or all columns became NA. The DataFrame might be empty or contain only non-convertible text.")
 
-def remove_fully_non_numeric_columns(df, logger_func=print):
+    return pd.DataFrame(numeric_cols, index=df.index)
 
-    cols_to_drop = []
-    for col in df.columns:
-        try:
-            #attempt to convert to numeric. If all are NaN, it's non-numeric.
-            if pd.to_numeric(df[col], errors='coerce').isna().all():
-              
-                if df[col].dtype == 'object':
 
-                     pass #handled by the numeric_cols logic below
-        except Exception as e:
-            logger_func(f"Could not assess numeric nature of column {col}: {e}")
-    
-    #more direct way to find numeric columns after cleaning attempts
-    numeric_cols_mask = []
-    for col_name in df.columns:
-        #check if at least one value in the column can be considered numeric
-        is_potentially_numeric = False
-        try:
-            if df[col_name].map(lambda x: isinstance(x, (int, float))).any(): #check if any are already numeric
-                 is_potentially_numeric = True
-            elif pd.to_numeric(df[col_name], errors='coerce').notna().any(): #check if any can be converted
-                 is_potentially_numeric = True
-        except Exception: #handle mixed types that pd.to_numeric might struggle with before apply
-            pass #will be caught by the numeric_cols_mask being False
+def shrink_numeric(df):
 
-        numeric_cols_mask.append(is_potentially_numeric)
-
-    if not any(numeric_cols_mask):
-        logger_func("Warning: No numeric columns found or all columns became NA. The DataFrame might be empty or contain only non-convertible text.")
+    #downcast numeric columns to the smallest dtype that holds their values without loss
+    downcast = {}
+    for col, series in df.items():
+        if pd.api.types.is_integer_dtype(series.dtype):
+            downcast[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series.dtype):
+            #pandas downcasts floats within a tolerance, so keep float32 only if no value changes
+            downcast_series = pd.to_numeric(series, downcast='float')
+            if downcast_series.astype(series.dtype).equals(series):
+                downcast[col] = downcast_series
+    df = df.copy(deep=False)
+    for col, series in downcast.items():
+        df[col] = series
+    return df
 
-    
-    return df.loc[:, numeric_cols_mask]
 
+def _clean_header(name):
+    name = _HEADER_CHINESE_PARENS_RE.sub("()", name)  #replace Chinese-style parentheses
+    name = _HEADER_PARENS_RE.sub("", name)            #remove content inside parentheses
+    name = _HEADER_BAD_CHARS_RE.sub("", name)         #keep spaces for now
+    name = name.replace(" ", "_")                     #replace spaces with underscores
+    name = _HEADER_UNDERSCORES_RE.sub("_", name)      #replace multiple underscores with single
+    name = name.strip('_')                            #remove leading/trailing underscores
+    return name.translate(_HEADER_NON_ASCII_TABLE) #drop remaining non-ASCII characters
 
 def clean_headers(df):
 
-    new_columns = df.columns.astype(str) #ensure all column names are strings
-    new_columns = (
-        new_columns.str.replace(r"[（）]", "()", regex=True)  #replace Chinese-style parentheses
-                  .str.replace(r"\(.*?\)", "", regex=True)  #remove content inside parentheses
-                  .str.replace(r"[^a-zA-Z0-9_\s-]", "", regex=True)  #keep spaces for now
-                  .str.replace(" ", "_")                   #replace spaces with underscores
-                  .str.replace(r"_+", "_", regex=True)     #replace multiple underscores with single
-                  .str.strip('_')                          #remove leading/trailing underscores
-                  .str.encode('ascii', errors='ignore').str.decode('ascii')
-    )
+    #each header goes through all cleaning steps in one pass
+    new_columns = [_clean_header(str(col)) for col in df.columns] #ensure all column names are strings
     #handle empty column names or duplicates by appending a number
     final_columns = []
     counts = {}
@@ -101,19 +164,23 @@ def clean_headers(df):
     df.columns = final_columns
     return df
 
-def report_missing_values(df, output_file, logger_func=print):
+def report_missing_values(df, na_mask, output_file, logger_func=print):
+    #missing values per column, from the NA mask shared with mean_imputation
+    write_missing_values_report(na_mask.sum(), len(df), output_file, logger_func)
+
+def write_missing_values_report(missing_per_column, n_rows, output_file, logger_func=print):
     try:
         #total datapoints in the dataset
-        total_datapoints = df.size
+        total_datapoints = n_rows * len(missing_per_column)
 
         #total missing values in the dataset
-        total_missing = df.isna().sum().sum()
+        total_missing = int(missing_per_column.sum())
 
         #percentage of missing values in the dataset
         missing_percentage_dataset = (total_missing / total_datapoints) * 100 if total_datapoints > 0 else 0
 
         #percentage of missing values per column
-        missing_percentage_columns = (df.isna().mean() * 100) if not df.empty else pd.Series(dtype=float)
+        missing_percentage_columns = (missing_per_column / n_rows * 100) if total_datapoints > 0 else pd.Series(dtype=float)
 
         report = [
             f"Missing Values Report for: {os.path.basename(output_file).replace('_report.txt', '.csv')}",
@@ -136,43 +203,254 @@ def report_missing_values(df, output_file, logger_func=print):
         logger_func(f"Error generating missing values report: {e}")
 
 
-def mean_imputation(df, logger_func=print):
+def mean_imputation(df, na_mask, logger_func=print):
     numeric_cols_df = df.select_dtypes(include=["number"])
-    non_numeric_cols = df.select_dtypes(exclude=["number"]).columns
-
-    if not numeric_cols_df.empty:
-        for col in numeric_cols_df.columns:
-            if df[col].isna().any():
-                mean_val = df[col].mean()
-                if pd.notna(mean_val):
-                    df[col] = df[col].fillna(mean_val).round(3)
-                    logger_func(f"Imputed missing values in column '{col}' with mean: {mean_val:.3f}")
-                else:
-                    logger_func(f"Could not calculate mean for column '{col}' (all NA after cleaning?). Leaving NAs.")
-            else:
-                #ensure numeric columns are rounded even if no imputation occurs
-                df[col] = df[col].round(3)
-
-
-    for col in non_numeric_cols:
-        if df[col].dtype == 'object':
-             df[col] = df[col].fillna(pd.NA)
+    if numeric_cols_df.empty:
+        return df
+
+    #only columns with missing values need a mean; na_mask is shared with the report
+    cols_with_na = numeric_cols_df.columns[na_mask[numeric_cols_df.columns].any()]
+    means = numeric_cols_df[cols_with_na].mean()
+
+    #fill the numeric columns with their means and round, in one DataFrame-wide call
+    #columns without missing values are rounded as well
+    imputed = numeric_cols_df.fillna(means).round(3)
+
+    #log one summary instead of a message per column
+    filled_cols = [col for col in cols_with_na if pd.notna(means[col])]
+    unfilled_cols = [col for col in cols_with_na if pd.isna(means[col])]
+    if filled_cols:
+        logger_func("Imputed missing values with column means: " + ", ".join(f"'{col}': {means[col]:.3f}" for col in filled_cols))
+    if unfilled_cols:
+        logger_func(f"Could not calculate mean for columns {', '.join(unfilled_cols)} (all NA after cleaning?). Leaving NAs.")
+
+    #new columns are set on a shallow copy so the caller's frame is never modified;
+    #not through assign(), whose keyword arguments break on a column named "self"
+    df = df.copy(deep=False)
+    df[list(imputed.columns)] = imputed
     return df
 
-def process_single_csv_file(file_path, report_folder, cleaned_folder, logger_func):
+def _csv_header(file_path, encoding):
+    with open(file_path, newline='', encoding=encoding) as file:
+        return next(csv.reader(file), [])
+
+def _with_file_header(df, header):
+    #pandas renames duplicate headers ("a", "a.1"); restoring the file's own header lets
+    #clean_headers number duplicates the same way as for files read by pyarrow
+    if len(header) == df.shape[1]:
+        df.columns = header
+    return df
+
+def _arrow_to_pandas(table):
+    #text columns stay Arrow-backed, which needs far less memory than Python string objects.
+    #pyarrow applies types_mapper by column name, so repeated names are swapped for
+    #positions during the conversion and put back afterwards
+    names = table.schema.names
+    df = table.rename_columns([str(i) for i in range(len(names))]).to_pandas(types_mapper={pa.string(): _ARROW_STRING}.get)
+    df.columns = names
+    return df
+
+def read_csv_file(file_path, encoding='utf8'):
+
+    #pyarrow parses the file with multiple threads; empty strings are read as missing, like pandas does
+    try:
+        table = pac.read_csv(file_path,
+                             read_options=pac.ReadOptions(encoding=encoding),
+                             convert_options=pac.ConvertOptions(strings_can_be_null=True))
+    except pa.ArrowInvalid:
+        #pyarrow rejects rows with fewer fields than the header; pandas fills them with NaN
+        df = pd.read_csv(file_path, encoding=encoding, low_memory=False)
+        return _with_file_header(df, _csv_header(file_path, encoding))
+
+    #pyarrow reads text that isn't valid in the encoding as binary instead of failing,
+    #so raise here and let the caller retry with a different encoding
+    binary_cols = [field.name for field in table.schema if pa.types.is_binary(field.type)]
+    if binary_cols:
+        raise ValueError(f"columns {', '.join(binary_cols)} are not valid {encoding} text")
+    return _arrow_to_pandas(table)
+
+def save_empty_placeholder(cleaned_folder, filename_no_ext, logger_func, output_parquet=True):
+    if output_parquet:
+        empty_cleaned_file = os.path.join(cleaned_folder, f"{filename_no_ext}_clean_empty.parquet")
+        pd.DataFrame().to_parquet(empty_cleaned_file, engine='pyarrow')
+    else:
+        empty_cleaned_file = os.path.join(cleaned_folder, f"{filename_no_ext}_clean_empty.csv")
+        pd.DataFrame().to_csv(empty_cleaned_file, index=False)
+    logger_func(f"Saved an empty placeholder: {empty_cleaned_file}")
+
+def _cleaned_file_path(cleaned_folder, filename_no_ext, output_parquet):
+    extension = "parquet" if output_parquet else "csv"
+    return os.path.join(cleaned_folder, f"{filename_no_ext}_clean.{extension}")
+
+def _open_cleaned_writer(cleaned_file, schema, output_parquet):
+    #Parquet (snappy) is the default; CSV formats every value as text and is kept as an option
+    if output_parquet:
+        return pq.ParquetWriter(cleaned_file, schema, compression='snappy')
+    return pac.CSVWriter(cleaned_file, schema, write_options=pac.WriteOptions(null_string='NA')) # Save NA as 'NA' string
+
+def save_schema(cleaned_file, schema, logger_func):
+    #column types of the cleaned file, saved next to it for reproducibility
+    schema_file = os.path.splitext(cleaned_file)[0] + "_schema.json"
+    with open(schema_file, "w", encoding='utf-8') as file:
+        json.dump({field.name: str(field.type) for field in schema}, file, indent=2)
+    logger_func(f"Schema saved: {schema_file}")
+
+def _csv_batch_to_pandas(batch):
+    #streamed columns are all read as text; columns holding only true/false become
+    #booleans, as pyarrow's type inference makes them when a file is read at once
+    columns = []
+    for column in batch.columns:
+        try:
+            bool_column = pc.cast(column, pa.bool_())
+        except pa.ArrowInvalid:
+            columns.append(column)
+            continue
+        #inference reads a column of only 1/0 as integers, and so must the stream
+        try:
+            pc.cast(column, pa.float64())
+        except pa.ArrowInvalid:
+            column = bool_column
+        columns.append(column)
+    return _arrow_to_pandas(pa.RecordBatch.from_arrays(columns, names=batch.schema.names))
+
+def _iter_csv_chunks(file_path, encoding, use_pandas=False):
+    #yields the file as pandas chunks under the file's own header, so both readers
+    #and the in-memory path leave duplicate names for clean_headers to number
+    header = _csv_header(file_path, encoding)
+    if use_pandas:
+        for chunk in pd.read_csv(file_path, encoding=encoding, low_memory=False, chunksize=CSV_CHUNK_SIZE):
+            yield _with_file_header(chunk, header)
+        return
+
+    #pyarrow infers column types from the first block only, so every column is read as
+    #text and converted per chunk; otherwise text after the first block would fail to parse
+    reader = pac.open_csv(file_path,
+                          read_options=pac.ReadOptions(encoding=encoding, block_size=CSV_BLOCK_SIZE,
+                                                       column_names=header, skip_rows=1),
+                          convert_options=pac.ConvertOptions(column_types={name: pa.string() for name in header},
+                                                             strings_can_be_null=True))
+    for batch in reader:
+        yield _csv_batch_to_pandas(batch)
+
+def _read_numeric_chunks(file_path, encoding, use_pandas, errors, columns=None):
+    #yields each chunk with cleaned headers and every column extracted to numbers or booleans.
+    #a column that fails to convert is left all-NaN in that chunk and recorded in errors
+    for chunk in _iter_csv_chunks(file_path, encoding, use_pandas):
+        chunk = clean_headers(chunk)
+        numeric = {}
+        for col in (chunk.columns if columns is None else columns):
+            try:
+                numeric[col] = _extract_numeric_series(chunk[col])
+            except Exception as e:
+                errors.setdefault(col, e)
+                numeric[col] = pd.Series(float('nan'), index=chunk.index)
+        yield pd.DataFrame(numeric, index=chunk.index)
+
+def _chunk_stats(file_path, encoding, use_pandas):
+    #columns that are boolean without missing values in every chunk are kept boolean,
+    #as they are when the whole file is read at once; the others are written as float64
+    sums, counts, n_rows, errors, bool_cols = None, None, 0, {}, None
+    for chunk in _read_numeric_chunks(file_path, encoding, use_pandas, errors):
+        chunk_bool_cols = {col for col, dtype in chunk.dtypes.items() if pd.api.types.is_bool_dtype(dtype)}
+        bool_cols = chunk_bool_cols if bool_cols is None else bool_cols & chunk_bool_cols
+        chunk = chunk.astype('float64')
+        chunk_sums, chunk_counts = chunk.sum(), chunk.count()
+        sums = chunk_sums if sums is None else sums + chunk_sums
+        counts = chunk_counts if counts is None else counts + chunk_counts
+        n_rows += len(chunk)
+    return sums, counts, n_rows, errors, bool_cols
+
+def _accumulate_chunk_stats(file_path, encoding):
+    #like read_csv_file, pandas is used when pyarrow rejects the file (e.g. short rows);
+    #the reader that succeeded is returned so the second pass uses the same one
+    try:
+        return _chunk_stats(file_path, encoding, False), False
+    except pa.ArrowInvalid:
+        return _chunk_stats(file_path, encoding, True), True
+
+def process_csv_in_chunks(file_path, report_folder, cleaned_folder, logger_func, output_parquet=True, output_name=None):
 
     base_filename = os.path.basename(file_path)
-    filename_no_ext = os.path.splitext(base_filename)[0]
+    filename_no_ext = output_name or os.path.splitext(base_filename)[0]
+
+    #first pass: per-column sums and non-missing counts give the report and the means
+    encoding = 'utf8'
+    try:
+        (sums, counts, n_rows, errors, bool_cols), use_pandas = _accumulate_chunk_stats(file_path, encoding)
+    except Exception as e:
+        logger_func(f"Error reading CSV {base_filename}: {e}. Trying with different encoding.")
+        encoding = 'latin1'
+        (sums, counts, n_rows, errors, bool_cols), use_pandas = _accumulate_chunk_stats(file_path, encoding)
+
+    if n_rows == 0:
+        logger_func(f"File {base_filename} is empty or could not be read properly. Skipping.")
+        return
+
+    logger_func(f"Initial shape of {base_filename}: {(n_rows, len(counts))}")
+
+    for col, e in errors.items():
+        logger_func(f"Error processing column {col} for numeric extraction: {e}")
+
+    #remove columns without a single numeric value, and columns that failed to convert
+    numeric_cols = [col for col in counts.index if counts[col] > 0 and col not in errors]
+    removed_cols = [col for col in counts.index if col not in numeric_cols]
+    if len(removed_cols):
+        logger_func(f"Removed fully non-numeric columns from {base_filename}: {', '.join(removed_cols)}")
+
+    if len(numeric_cols) == 0:
+        logger_func(f"DataFrame for {base_filename} became empty after removing non-numeric columns. No further processing.")
+        save_empty_placeholder(cleaned_folder, filename_no_ext, logger_func, output_parquet)
+        return
+
+    #generate a report on missing values *before* imputation
+    report_file = os.path.join(report_folder, f"{filename_no_ext}_report.txt")
+    write_missing_values_report(n_rows - counts[numeric_cols], n_rows, report_file, logger_func)
+
+    means = sums[numeric_cols] / counts[numeric_cols]
+    cols_with_na = [col for col in numeric_cols if counts[col] < n_rows]
+    if cols_with_na:
+        logger_func("Imputed missing values with column means: " + ", ".join(f"'{col}': {means[col]:.3f}" for col in cols_with_na))
+
+    #second pass: impute, round and append each chunk to the cleaned file;
+    #every chunk is cast to the same dtypes so they all share one schema
+    dtypes = {col: 'bool' if col in bool_cols else 'float64' for col in numeric_cols}
+    cleaned_file = _cleaned_file_path(cleaned_folder, filename_no_ext, output_parquet)
+    writer = None
+    try:
+        for chunk in _read_numeric_chunks(file_path, encoding, use_pandas, {}, numeric_cols):
+            chunk = chunk.astype(dtypes)
+            table = pa.Table.from_pandas(chunk.fillna(means).round(3), preserve_index=False)
+            if writer is None:
+                writer = _open_cleaned_writer(cleaned_file, table.schema, output_parquet)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger_func(f"Cleaned file saved: {cleaned_file}")
+    save_schema(cleaned_file, table.schema, logger_func)
+    logger_func(f"Final shape of {base_filename}: {(n_rows, len(numeric_cols))}")
+
+def process_single_csv_file(file_path, report_folder, cleaned_folder, logger_func, output_parquet=True, output_name=None):
+
+    base_filename = os.path.basename(file_path)
+    filename_no_ext = output_name or os.path.splitext(base_filename)[0]
 
     logger_func(f"--- Starting processing for: {base_filename} ---")
     try:
+        #stream very large files in chunks instead of loading them into memory at once
+        if os.path.getsize(file_path) > LARGE_FILE_THRESHOLD:
+            logger_func(f"{base_filename} is larger than {LARGE_FILE_THRESHOLD // (1024 * 1024)} MB, processing it in chunks of {CSV_BLOCK_SIZE // (1024 * 1024)} MB.")
+            process_csv_in_chunks(file_path, report_folder, cleaned_folder, logger_func, output_parquet, filename_no_ext)
+            return
+
         #load the CSV file
         try:
-            df = pd.read_csv(file_path, low_memory=False)
+            df = read_csv_file(file_path)
         except Exception as e:
             logger_func(f"Error reading CSV {base_filename}: {e}. Trying with different encoding.")
             try:
-                df = pd.read_csv(file_path, encoding='latin1', low_memory=False)
+                df = read_csv_file(file_path, encoding='latin1')
             except Exception as e_enc:
                 logger_func(f"Failed to read {base_filename} with fallback encoding: {e_enc}")
                 return
@@ -187,36 +465,39 @@ def process_single_csv_file(file_path, report_folder, cleaned_folder, logger_fun
         df = clean_headers(df)
         logger_func(f"Headers cleaned for {base_filename}.")
 
-        #clean mixed numeric and non-numeric columns (attempt to extract numerics)
-        df = clean_mixed_columns(df.copy(), logger_func) # Use .copy() to avoid SettingWithCopyWarning
-        logger_func(f"Mixed-type columns processed for {base_filename}.")
-        
-        #remove columns that are fully non-numeric (or became all NA after cleaning)
+        #extract numerics from mixed columns and remove columns that are fully
+        #non-numeric (or became all NA after cleaning) in a single pass
         original_cols = df.columns.tolist()
-        df = remove_fully_non_numeric_columns(df.copy(), logger_func)
-        removed_cols = set(original_cols) - set(df.columns.tolist())
+        df = extract_numeric_columns(df, logger_func)
+        logger_func(f"Mixed-type columns processed for {base_filename}.")
+        removed_cols = [col for col in original_cols if col not in df.columns]
         if removed_cols:
             logger_func(f"Removed fully non-numeric columns from {base_filename}: {', '.join(removed_cols)}")
         
         if df.empty or df.shape[1] == 0:
             logger_func(f"DataFrame for {base_filename} became empty after removing non-numeric columns. No further processing.")
-            empty_cleaned_file = os.path.join(cleaned_folder, f"{filename_no_ext}_clean_empty.csv")
-            pd.DataFrame().to_csv(empty_cleaned_file, index=False)
-            logger_func(f"Saved an empty placeholder: {empty_cleaned_file}")
+            save_empty_placeholder(cleaned_folder, filename_no_ext, logger_func, output_parquet)
             return
 
         #generate a report on missing values *before* imputation
         report_file = os.path.join(report_folder, f"{filename_no_ext}_report.txt")
-        report_missing_values(df, report_file, logger_func)
+        na_mask = df.isna() #computed once, shared by the report and the imputation
+        report_missing_values(df, na_mask, report_file, logger_func)
 
         #perform mean imputation
-        df = mean_imputation(df.copy(), logger_func)
+        df = mean_imputation(df, na_mask, logger_func)
         logger_func(f"Mean imputation completed for {base_filename}.")
 
+        #shrink numeric dtypes of the final values to reduce memory and output size
+        df = shrink_numeric(df)
+
         #save cleaned file
-        cleaned_file = os.path.join(cleaned_folder, f"{filename_no_ext}_clean.csv")
-        df.to_csv(cleaned_file, index=False, na_rep='NA') # Save NA as 'NA' string
+        cleaned_file = _cleaned_file_path(cleaned_folder, filename_no_ext, output_parquet)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with _open_cleaned_writer(cleaned_file, table.schema, output_parquet) as writer:
+            writer.write_table(table)
         logger_func(f"Cleaned file saved: {cleaned_file}")
+        save_schema(cleaned_file, table.schema, logger_func)
         logger_func(f"Final shape of {base_filename}: {df.shape}")
 
     except Exception as e:
@@ -227,24 +508,105 @@ def process_single_csv_file(file_path, report_folder, cleaned_folder, logger_fun
         logger_func(f"--- Finished processing for: {base_filename} ---\n")
 
 
-def main_processing_logic(input_folder, report_folder, cleaned_folder, logger_func):
+def _init_worker(arrow_threads):
+    #pyarrow sizes its thread pool to the whole machine in every process; the workers
+    #share the cores between them instead
+    pa.set_cpu_count(arrow_threads)
+
+def _queue_logger(log_queue, message):
+    #the Manager holding the queue is gone if the app exited mid-batch
+    try:
+        log_queue.put(message)
+    except (EOFError, OSError):
+        pass
+
+def _relay_log_messages(log_queue, logger_func):
+    #forward worker messages to logger_func until the None sentinel arrives,
+    #or until the Manager holding the queue has been shut down
+    try:
+        for message in iter(log_queue.get, None):
+            logger_func(message)
+    except (EOFError, OSError):
+        pass
+
+def _output_names(csv_files, input_folder):
+    #outputs are named after the file; a file whose name is already taken by one in
+    #another subfolder is named after its relative path instead, so no two workers
+    #write the same report or cleaned file. names are compared case-insensitively
+    #for file systems that don't tell "Data" and "data" apart
+    names, used = {}, set()
+    for file_path in csv_files:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        if name.lower() in used:
+            name = os.path.splitext(os.path.relpath(file_path, input_folder))[0].replace(os.sep, "_")
+            base_name, n = name, 1
+            while name.lower() in used:
+                n += 1
+                name = f"{base_name}_{n}"
+        used.add(name.lower())
+        names[file_path] = name
+    return names
+
+def main_processing_logic(input_folder, report_folder, cleaned_folder, logger_func, output_parquet=True, on_executor=None):
 
     logger_func("Starting CSV processing...")
     os.makedirs(report_folder, exist_ok=True)
     os.makedirs(cleaned_folder, exist_ok=True)
 
-    found_csv_files = False
-    for root, _, files in os.walk(input_folder):
-        for file in files:
-            if file.lower().endswith('.csv'):
-                found_csv_files = True
-                file_path = os.path.join(root, file)
-                process_single_csv_file(file_path, report_folder, cleaned_folder, logger_func)
-    
-    if not found_csv_files:
+    csv_files = [os.path.join(root, file)
+                 for root, _, files in os.walk(input_folder)
+                 for file in files if file.lower().endswith('.csv')]
+
+    if not csv_files:
         logger_func("No CSV files found in the input folder.")
+    else:
+        #every file is independent, so files are processed in parallel worker processes.
+        #logger_func may be a bound GUI method that can't be pickled, so workers log
+        #through a queue that is relayed to logger_func by a thread in this process.
+        #spawn avoids forking a process that is running the Tk event loop.
+        mp_context = multiprocessing.get_context('spawn')
+        cpu_count = os.cpu_count() or 1
+        max_workers = min(MAX_WORKERS, cpu_count, len(csv_files))
+        output_names = _output_names(csv_files, input_folder)
+        for file_path, name in output_names.items():
+            if name != os.path.splitext(os.path.basename(file_path))[0]:
+                logger_func(f"{os.path.relpath(file_path, input_folder)} has the same name as another file, its outputs are saved as {name}.")
+        with mp_context.Manager() as manager:
+            log_queue = manager.Queue()
+            relay_thread = threading.Thread(target=_relay_log_messages, args=(log_queue, logger_func), daemon=True)
+            relay_thread.start()
+            worker_logger = functools.partial(_queue_logger, log_queue)
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                                         initializer=_init_worker, initargs=(max(1, cpu_count // max_workers),)) as executor:
+                    futures = {executor.submit(process_single_csv_file, file_path, report_folder, cleaned_folder, worker_logger, output_parquet, output_names[file_path]): file_path
+                               for file_path in csv_files}
+                    #the caller gets the executor so it can cancel the remaining files
+                    if on_executor is not None:
+                        on_executor(executor)
+                    for future in as_completed(futures):
+                        if future.cancelled():
+                            worker_logger(f"Cancelled processing of {os.path.basename(futures[future])}.")
+                            continue
+                        try:
+                            future.result()
+                        except Exception as e:
+                            worker_logger(f"!!! Worker failed for file {os.path.basename(futures[future])}: {e}")
+            finally:
+                worker_logger(None)
+                relay_thread.join()
+
     logger_func("All CSV processing finished.")
 
+#how often the GUI drains queued log messages, and how many lines it inserts per drain
+LOG_POLL_INTERVAL_MS = 50
+LOG_BATCH_SIZE = 200
+
+#the log widget keeps only the newest lines; every line is also appended to the log file,
+#which sits next to the script rather than in whatever directory the app was started from
+MAX_LOG_LINES = 5000
+LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cleandb.log")
+
 #main GUI
 class CSVCleanerApp:
     def __init__(self, master):
@@ -271,6 +633,9 @@ class CSVCleanerApp:
         self.report_folder_path.set("reports")
         self.cleaned_folder_path.set("cleaned_csv")
 
+        #cleaned files are saved as Parquet unless CSV output is chosen
+        self.output_parquet = tk.BooleanVar(value=True)
+
         #input Folder
         input_frame = ttk.Frame(master, padding=10)
         input_frame.pack(fill=tk.X)
@@ -292,6 +657,11 @@ class CSVCleanerApp:
         ttk.Entry(cleaned_frame, textvariable=self.cleaned_folder_path, width=50).pack(side=tk.LEFT, expand=True, fill=tk.X, padx=5)
         ttk.Button(cleaned_frame, text="Browse...", command=lambda: self._browse_directory(self.cleaned_folder_path, "Select Cleaned CSV Output Folder")).pack(side=tk.LEFT)
 
+        #output format
+        format_frame = ttk.Frame(master, padding=(10, 0))
+        format_frame.pack(fill=tk.X)
+        ttk.Checkbutton(format_frame, text="Save cleaned files as Parquet (uncheck for CSV)", variable=self.output_parquet).pack(side=tk.LEFT)
+
         #process Button
         self.process_button = ttk.Button(master, text="Start Processing", command=self._start_processing)
         self.process_button.pack(pady=15, ipadx=10, ipady=5)
@@ -305,12 +675,37 @@ class CSVCleanerApp:
         bottom_frame = ttk.Frame(master, padding=10)
         bottom_frame.pack(fill=tk.X, side=tk.BOTTOM)
         
-        self.quit_button = ttk.Button(bottom_frame, text="Quit", command=master.quit)
+        self.quit_button = ttk.Button(bottom_frame, text="Quit", command=self._quit)
         self.quit_button.pack(side=tk.RIGHT, padx=5)
         
         self.about_button = ttk.Button(bottom_frame, text="About", command=self._show_about)
         self.about_button.pack(side=tk.RIGHT)
 
+        #log messages from worker threads are queued and inserted by the GUI in batches
+        self._log_queue = queue.Queue()
+        try:
+            self._log_file = open(LOG_FILE, "a", encoding='utf-8')
+        except OSError:
+            self._log_file = None #no write access next to the script, log to the widget only
+        #executor of the running batch, cancelled on quit
+        self._executor = None
+        self._closing = False
+        master.protocol("WM_DELETE_WINDOW", self._quit)
+        self.master.after(LOG_POLL_INTERVAL_MS, self._drain_log)
+
+    def _set_executor(self, executor):
+        self._executor = executor
+
+    def _quit(self):
+        #files not yet started are cancelled so exiting doesn't wait for the whole batch;
+        #files already being cleaned are finished so no half-written output is left
+        self._closing = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self.master.quit()
 
     def _browse_directory(self, path_var, title):
         directory = filedialog.askdirectory(title=title)
@@ -318,14 +713,31 @@ class CSVCleanerApp:
             path_var.set(directory)
 
     def _log_message(self, message):
-        self.master.after(0, self._update_gui_log, message)
+        self._log_queue.put(str(message))
 
-    def _update_gui_log(self, message):
-        self.status_area.config(state=tk.NORMAL)
-        self.status_area.insert(tk.END, str(message) + "\n")
-        self.status_area.see(tk.END) #scroll to the end
-        self.status_area.config(state=tk.DISABLED)
-        self.master.update_idletasks() #process pending GUI events, helps with responsiveness
+    def _drain_log(self):
+        lines = []
+        try:
+            while len(lines) < LOG_BATCH_SIZE:
+                lines.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if lines:
+            text = "\n".join(lines) + "\n"
+            if self._log_file is not None:
+                self._log_file.write(text)
+                self._log_file.flush()
+
+            self.status_area.config(state=tk.NORMAL)
+            self.status_area.insert(tk.END, text)
+            #drop the oldest lines so the widget doesn't grow without bound
+            line_count = int(self.status_area.index('end-1c').split('.')[0])
+            if line_count > MAX_LOG_LINES:
+                self.status_area.delete('1.0', f'{line_count - MAX_LOG_LINES}.0')
+            self.status_area.see(tk.END) #scroll to the end
+            self.status_area.config(state=tk.DISABLED)
+        self.master.after(LOG_POLL_INTERVAL_MS, self._drain_log)
 
     def _show_about(self):
         messagebox.showinfo("About CSV Data Cleaner++",
@@ -335,13 +747,15 @@ class CSVCleanerApp:
                             "- Extract numeric data from mixed-type columns.\n"
                             "- Remove columns that are entirely non-numeric.\n"
                             "- Generate missing value reports.\n"
-                            "- Perform mean imputation for numeric columns.\n\n"
+                            "- Perform mean imputation for numeric columns.\n"
+                            "- Save cleaned data as Parquet or CSV.\n\n"
                             "Developed by ODAT project.")
 
     def _start_processing(self):
         input_f = self.input_folder_path.get()
         report_f = self.report_folder_path.get()
         cleaned_f = self.cleaned_folder_path.get()
+        output_parquet = self.output_parquet.get()
 
         if not all([input_f, report_f, cleaned_f]):
             messagebox.showerror("Error", "All folder paths must be specified.")
@@ -360,26 +774,29 @@ class CSVCleanerApp:
         self._log_message(f"Input Folder: {input_f}")
         self._log_message(f"Report Folder: {report_f}")
         self._log_message(f"Cleaned Folder: {cleaned_f}")
+        self._log_message(f"Output Format: {'Parquet' if output_parquet else 'CSV'}")
         
         self.process_button.config(state=tk.DISABLED)
         self.quit_button.config(state=tk.DISABLED) 
 
         #run processing in a separate thread
         self.processing_thread = threading.Thread(target=self._processing_thread_target,
-                                                  args=(input_f, report_f, cleaned_f))
+                                                  args=(input_f, report_f, cleaned_f, output_parquet))
         self.processing_thread.daemon = True 
         self.processing_thread.start()
 
-    def _processing_thread_target(self, input_f, report_f, cleaned_f):
+    def _processing_thread_target(self, input_f, report_f, cleaned_f, output_parquet):
         try:
-            main_processing_logic(input_f, report_f, cleaned_f, self._log_message)
+            main_processing_logic(input_f, report_f, cleaned_f, self._log_message, output_parquet, self._set_executor)
         except Exception as e:
             self._log_message(f"An unexpected error occurred in the processing thread: {e}")
             import traceback
             self._log_message(traceback.format_exc())
         finally:
-            #ensure buttons are re-enabled in the main thread
-            self.master.after(0, self._finalize_processing)
+            self._executor = None
+            #ensure buttons are re-enabled in the main thread, unless the app is exiting
+            if not self._closing:
+                self.master.after(0, self._finalize_processing)
 
     def _finalize_processing(self):
         self.process_button.config(state=tk.NORMAL)